@@ -1,5 +1,27 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+from utils import get_competency_columns, DATAFRAME_HASH_FUNCS
+
+
+@st.cache_data(show_spinner=False, hash_funcs=DATAFRAME_HASH_FUNCS)
+def _csv_bytes(df):
+    return df.to_csv(index=False, lineterminator='\n').encode('utf-8')
+
+
+@st.cache_data(show_spinner=False, hash_funcs=DATAFRAME_HASH_FUNCS)
+def _admin_stats(df):
+    counts = df.groupby('Cluster', sort=True, observed=True).size()
+    pct = (counts * (100.0 / counts.sum())).round(2)
+    missing = len(df) - df.count()
+    missing = missing[missing > 0]
+    competency_cols = get_competency_columns(df)
+    comp_stats = None
+    if competency_cols:
+        # Handed to st.dataframe as Arrow so reruns skip the pandas -> Arrow conversion
+        summary = df[competency_cols].describe().round(2).reset_index(names='Statistic')
+        comp_stats = pa.Table.from_pandas(summary, preserve_index=False)
+    return counts, pct, missing, comp_stats
 
 
 def show_admin_tools(df):
@@ -10,25 +32,30 @@ def show_admin_tools(df):
     
     with tab1:
         st.subheader("Dataset Information")
-        st.write(f"**Total Records:** {len(df)}")
-        st.write(f"**Total Features:** {len(df.columns)}")
-        st.write(f"**Clusters:** {df['Cluster'].nunique()}")
+        st.markdown(
+            f"**Total Records:** {len(df)}  \n"
+            f"**Total Features:** {len(df.columns)}  \n"
+            f"**Clusters:** {df['Cluster'].nunique()}"
+        )
         
         st.divider()
         
         st.subheader("Preview Data")
         num_rows = st.number_input("Number of rows to display", min_value=1, max_value=100, value=10, key="admin_rows")
-        st.dataframe(df.head(num_rows), use_container_width=True)
+        preview = df.head(num_rows).reset_index(drop=True)
+        st.dataframe(preview, use_container_width=True, hide_index=True)
         
         st.subheader("Download Data")
-        csv = df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 Download as CSV",
-            data=csv,
-            file_name="clustering_results.csv",
-            mime="text/csv",
-            key="download_main_csv"
-        )
+        # Serialize only once the admin asks for the export
+        if st.toggle("Prepare CSV export", key="admin_download_open"):
+            csv = _csv_bytes(df)
+            st.download_button(
+                label="📥 Download as CSV",
+                data=csv,
+                file_name="clustering_results.csv",
+                mime="text/csv",
+                key="download_main_csv"
+            )
     
     with tab2:
         st.subheader("Export Visualizations")
@@ -45,28 +72,30 @@ def show_admin_tools(df):
     
     with tab3:
         st.subheader("Detailed Statistics")
+        if not st.toggle("Compute statistics", key="admin_stats_open"):
+            st.caption("Turn on to compute cluster, missing-value and competency statistics.")
+            return
+        
+        counts, pct, missing, comp_stats = _admin_stats(df)
         
         st.write("**Cluster Distribution:**")
         cluster_stats = pd.DataFrame({
-            'Cluster': df['Cluster'].value_counts().sort_index(),
-            'Percentage': (df['Cluster'].value_counts(normalize=True).sort_index() * 100).round(2)
+            'Cluster': counts,
+            'Percentage': pct
         })
         st.dataframe(cluster_stats, use_container_width=True)
         
         st.divider()
         
         st.write("**Missing Values Check:**")
-        missing = df.isnull().sum()
-        if missing.sum() > 0:
-            st.dataframe(missing[missing > 0], use_container_width=True)
+        if not missing.empty:
+            st.dataframe(missing, use_container_width=True)
         else:
             st.success("✅ No missing values in the dataset!")
         
         st.divider()
         
         st.write("**Competency Ratings Summary:**")
-        competency_cols = [col for col in df.columns if col.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.', '11.', '12.', '13.'))]
-        if competency_cols:
-            comp_stats = df[competency_cols].describe().round(2)
+        if comp_stats is not None:
             st.dataframe(comp_stats, use_container_width=True)
 
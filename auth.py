@@ -2,15 +2,17 @@
 Authentication module with improved security
 """
 import streamlit as st
-import json
+import copy
+import orjson
 import os
+import shutil
 import logging
 from datetime import datetime
 from typing import Tuple, Optional
-from security import hash_password, verify_password, validate_username, validate_password, sanitize_input, escape_html
+from security import hash_password, verify_password, needs_rehash, validate_username, validate_password, sanitize_input, escape_html
 from config import (
     USERS_FILE, DEFAULT_ADMIN_USERNAME, DEFAULT_ADMIN_PASSWORD,
-    ROLE_ADMIN, ROLE_TEACHER, PASSWORD_MIN_LENGTH, USERNAME_MIN_LENGTH,
+    ROLE_ADMIN, ROLE_TEACHER, PASSWORD_MIN_LENGTH, USERNAME_MIN_LENGTH, MAX_FAILED_ATTEMPTS,
     APP_NAME, APP_TAGLINE
 )
 
@@ -20,18 +22,83 @@ logger = logging.getLogger(__name__)
 
 # Google Sheets backend removed – using local JSON storage
 
+# Parsed users file and its lowercase-username index, reused while the file's
+# modification time is unchanged
+_USERS_CACHE = {'mtime': None, 'data': None, 'lower_index': {}}
 
-def load_users() -> dict:
+
+def _users_file_mtime() -> Optional[int]:
+    """Return the users file's mtime in nanoseconds, or None if it is missing"""
+    try:
+        return os.stat(USERS_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _cache_users(users: dict, mtime: Optional[int]) -> None:
+    """Remember users as the parsed contents of the users file at mtime"""
+    _USERS_CACHE['mtime'] = mtime
+    _USERS_CACHE['data'] = copy.deepcopy(users) if mtime is not None else None
+    _USERS_CACHE['lower_index'] = {u.lower(): u for u in users} if mtime is not None else {}
+
+
+def _find_username(users: dict, username: str) -> Optional[str]:
     """
-    Load users from JSON file with error handling.
+    Case-insensitive username lookup.
     
+    Args:
+        users: Dictionary of users as returned by load_users
+        username: Username to look up
+        
     Returns:
-        Dictionary of users
+        The stored spelling of the username, or None if it does not exist
     """
-    users = {}
+    username_lower = username.lower()
+    if _USERS_CACHE['mtime'] is not None:
+        matching_username = _USERS_CACHE['lower_index'].get(username_lower)
+        if matching_username is None or matching_username in users:
+            return matching_username
+    # Cache unavailable or out of step with users: fall back to a scan
+    for u in users.keys():
+        if u.lower() == username_lower:
+            return u
+    return None
+
+
+def _remember_failed_attempts(username: str, failed_attempts: int) -> bool:
+    """
+    Record a below-lockout failed attempt count in the users cache only.
     
-    # Default admin account with improved security
-    default_admin = {
+    The count reaches disk with the next save (successful login or lockout).
+    The cache is per process, so until then a restart or another worker
+    process sees the last saved count; login saves the first failure, so
+    that count is never below one once an account has started failing.
+    
+    Args:
+        username: Stored spelling of the username
+        failed_attempts: New failed attempt count
+        
+    Returns:
+        True if recorded, False if the cache is unavailable and the caller must save
+    """
+    cached = _USERS_CACHE['data']
+    if _USERS_CACHE['mtime'] is None or cached is None or username not in cached:
+        return False
+    cached[username]['failed_attempts'] = failed_attempts
+    return True
+
+
+def _default_admin_users() -> dict:
+    """
+    Build the default admin account.
+    
+    Only called when the account has to be created, since hashing the
+    password is the expensive part of loading users.
+    
+    Returns:
+        Dictionary with the default admin user
+    """
+    return {
         DEFAULT_ADMIN_USERNAME: {
             'password': hash_password(DEFAULT_ADMIN_PASSWORD),
             'role': ROLE_ADMIN,
@@ -40,27 +107,39 @@ def load_users() -> dict:
             'failed_attempts': 0
         }
     }
+
+
+def load_users() -> dict:
+    """
+    Load users from JSON file with error handling.
+    
+    Returns:
+        Dictionary of users
+    """
+    mtime = _users_file_mtime()
+    if mtime is not None and mtime == _USERS_CACHE['mtime']:
+        # Callers mutate the returned dict, so hand out a copy of the cached one
+        return copy.deepcopy(_USERS_CACHE['data'])
+    
+    users = {}
     
     if os.path.exists(USERS_FILE):
         try:
-            with open(USERS_FILE, 'r', encoding='utf-8') as f:
-                users = json.load(f)
+            with open(USERS_FILE, 'rb') as f:
+                users = orjson.loads(f.read())
+            _cache_users(users, mtime)
             logger.info("Users loaded from JSON file")
         except Exception as e:
             logger.error(f"Error loading users file: {e}")
-            users = default_admin
+            users = _default_admin_users()
     else:
-        users = default_admin
+        users = _default_admin_users()
         save_users(users)
         logger.info("Created new users storage with default admin")
     
-    # Ensure admin account always exists with current security standards
+    # Ensure admin account always exists; legacy hashes are upgraded at login
     if DEFAULT_ADMIN_USERNAME not in users:
-        users[DEFAULT_ADMIN_USERNAME] = default_admin[DEFAULT_ADMIN_USERNAME]
-        save_users(users)
-    elif ':' not in users[DEFAULT_ADMIN_USERNAME].get('password', ''):
-        # Migrate old password hash to new format
-        users[DEFAULT_ADMIN_USERNAME]['password'] = hash_password(DEFAULT_ADMIN_PASSWORD)
+        users.update(_default_admin_users())
         save_users(users)
     
     return users
@@ -77,21 +156,32 @@ def save_users(users: dict) -> bool:
         True if successful, False otherwise
     """
     try:
-        # Create backup
+        # Write the new contents next to the real file first
+        tmp_file = f"{USERS_FILE}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(users, option=orjson.OPT_NON_STR_KEYS))
+        
+        # Create backup: hard-link the current file instead of copying its bytes
         if os.path.exists(USERS_FILE):
             backup_file = f"{USERS_FILE}.backup"
             try:
-                with open(USERS_FILE, 'r', encoding='utf-8') as f:
-                    backup_data = f.read()
-                with open(backup_file, 'w', encoding='utf-8') as f:
-                    f.write(backup_data)
-            except Exception:
-                pass
-        with open(USERS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(users, f, indent=4, ensure_ascii=False)
+                if os.path.exists(backup_file):
+                    os.remove(backup_file)
+                os.link(USERS_FILE, backup_file)
+            except OSError:
+                try:
+                    shutil.copyfile(USERS_FILE, backup_file)
+                except Exception:
+                    pass
+        
+        # Atomic publish: readers see either the old or the new file, never a partial one
+        os.replace(tmp_file, USERS_FILE)
+        _cache_users(users, _users_file_mtime())
         return True
     except Exception as e:
         logger.error(f"Error saving users file: {e}")
+        # The file may not match what was cached; force the next load to re-read it
+        _cache_users({}, None)
         return False
 
 
@@ -124,7 +214,7 @@ def signup(username: str, password: str) -> Tuple[bool, str]:
     users = load_users()
     
     # Check if username already exists
-    if username.lower() in [u.lower() for u in users.keys()]:
+    if _find_username(users, username) is not None:
         return False, "Username already exists"
     
     # Create new user
@@ -132,7 +222,7 @@ def signup(username: str, password: str) -> Tuple[bool, str]:
         users[username] = {
             'password': hash_password(password),
             'role': ROLE_TEACHER,  # All new signups are teachers
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'created_at': datetime.now().isoformat(sep=' ', timespec='seconds'),
             'last_login': None,
             'failed_attempts': 0
         }
@@ -169,12 +259,7 @@ def login(username: str, password: str) -> Tuple[bool, str, Optional[str]]:
     users = load_users()
     
     # Case-insensitive username lookup
-    username_lower = username.lower()
-    matching_username = None
-    for u in users.keys():
-        if u.lower() == username_lower:
-            matching_username = u
-            break
+    matching_username = _find_username(users, username)
     
     if not matching_username:
         return False, "Invalid username or password", None
@@ -183,17 +268,22 @@ def login(username: str, password: str) -> Tuple[bool, str, Optional[str]]:
     
     # Verify password
     if not verify_password(password, user.get('password', '')):
-        # Track failed attempts
+        # Track failed attempts; the first failure and a lockout are written to disk right away
         user['failed_attempts'] = user.get('failed_attempts', 0) + 1
-        save_users(users)
         
-        if user['failed_attempts'] >= 5:
+        if user['failed_attempts'] >= MAX_FAILED_ATTEMPTS:
+            save_users(users)
             return False, "Account locked due to too many failed attempts. Please contact administrator.", None
         
-        return False, f"Invalid username or password ({user['failed_attempts']}/5 attempts)", None
+        if user['failed_attempts'] == 1 or not _remember_failed_attempts(matching_username, user['failed_attempts']):
+            save_users(users)
+        
+        return False, f"Invalid username or password ({user['failed_attempts']}/{MAX_FAILED_ATTEMPTS} attempts)", None
     
-    # Successful login
-    user['last_login'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    # Successful login; upgrade legacy SHA-256 hashes now that the plain password is known
+    if needs_rehash(user.get('password', '')):
+        user['password'] = hash_password(password)
+    user['last_login'] = datetime.now().isoformat(sep=' ', timespec='seconds')
     user['failed_attempts'] = 0
     save_users(users)
     
@@ -202,92 +292,97 @@ def login(username: str, password: str) -> Tuple[bool, str, Optional[str]]:
     return True, "Login successful!", role
 
 
-def show_auth_page():
-    """Display login/signup page with improved security"""
+_AUTH_CSS = """
+    <style>
+    .auth-container {
+        max-width: 500px;
+        margin: 0 auto;
+        padding: 2rem;
+    }
+    .auth-header {
+        text-align: center;
+        color: #1E88E5;
+        margin-bottom: 2rem;
+    }
+    .auth-title {
+        font-size: 2.5rem;
+        font-weight: 700;
+        color: #0D47A1;
+        margin-bottom: 0.5rem;
+        word-wrap: break-word;
+    }
+    .auth-subtitle {
+        font-size: 1.2rem;
+        color: #424242;
+        font-weight: 400;
+        word-wrap: break-word;
+    }
+    .security-info {
+        font-size: 0.85rem;
+        color: #666;
+        margin-top: 0.5rem;
+    }
     
-    # Custom CSS for auth page with mobile responsiveness
-    st.markdown("""
-        <style>
+    /* Mobile responsive */
+    @media (max-width: 768px) {
         .auth-container {
-            max-width: 500px;
-            margin: 0 auto;
-            padding: 2rem;
-        }
-        .auth-header {
-            text-align: center;
-            color: #1E88E5;
-            margin-bottom: 2rem;
+            padding: 1rem;
+            max-width: 100%;
         }
+        
         .auth-title {
-            font-size: 2.5rem;
-            font-weight: 700;
-            color: #0D47A1;
-            margin-bottom: 0.5rem;
-            word-wrap: break-word;
-        }
-        .auth-subtitle {
-            font-size: 1.2rem;
-            color: #424242;
-            font-weight: 400;
-            word-wrap: break-word;
-        }
-        .security-info {
-            font-size: 0.85rem;
-            color: #666;
-            margin-top: 0.5rem;
+            font-size: 2rem;
         }
         
-        /* Mobile responsive */
-        @media (max-width: 768px) {
-            .auth-container {
-                padding: 1rem;
-                max-width: 100%;
-            }
-            
-            .auth-title {
-                font-size: 2rem;
-            }
-            
-            .auth-subtitle {
-                font-size: 1rem;
-            }
+        .auth-subtitle {
+            font-size: 1rem;
         }
-        
-        @media (max-width: 480px) {
-            .auth-container {
-                padding: 0.75rem;
-            }
-            
-            .auth-title {
-                font-size: 1.75rem;
-            }
-            
-            .auth-subtitle {
-                font-size: 0.9rem;
-            }
+    }
+    
+    @media (max-width: 480px) {
+        .auth-container {
+            padding: 0.75rem;
         }
         
-        /* Touch-friendly inputs */
-        .stTextInput > div > div > input,
-        .stSelectbox > div > div > select {
-            min-height: 44px;
-            font-size: 16px; /* Prevents zoom on iOS */
+        .auth-title {
+            font-size: 1.75rem;
         }
         
-        .stButton > button {
-            min-height: 44px;
-            font-size: 1rem;
+        .auth-subtitle {
+            font-size: 0.9rem;
         }
-        </style>
-    """, unsafe_allow_html=True)
+    }
+    
+    /* Touch-friendly inputs */
+    .stTextInput > div > div > input,
+    .stSelectbox > div > div > select {
+        min-height: 44px;
+        font-size: 16px; /* Prevents zoom on iOS */
+    }
+    
+    .stButton > button {
+        min-height: 44px;
+        font-size: 1rem;
+    }
+    </style>
+"""
+
+_AUTH_HEADER = f'''
+    <div class="auth-header">
+        <div class="auth-title">📚 {APP_NAME}</div>
+        <div class="auth-subtitle">{APP_TAGLINE}</div>
+    </div>
+'''
+
+
+def show_auth_page():
+    """Display login/signup page with improved security"""
+    
+    # Custom CSS for auth page with mobile responsiveness
+    st.markdown(_AUTH_CSS, unsafe_allow_html=True)
     
     st.markdown('<div class="auth-container">', unsafe_allow_html=True)
-    st.markdown(f'''
-        <div class="auth-header">
-            <div class="auth-title">📚 {APP_NAME}</div>
-            <div class="auth-subtitle">{APP_TAGLINE}</div>
-        </div>
-    ''', unsafe_allow_html=True)
+    st.markdown(_AUTH_HEADER, unsafe_allow_html=True)
     
     tab1, tab2 = st.tabs(["🔐 Login", "📝 Sign Up"])
     
@@ -306,6 +401,7 @@ def show_auth_page():
                     if success:
                         st.session_state.logged_in = True
                         st.session_state.username = username
+                        st.session_state.safe_username = escape_html(username)
                         st.session_state.user_role = role
                         st.success(message)
                         st.rerun()
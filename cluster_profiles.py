@@ -1,31 +1,80 @@
 import streamlit as st
 import plotly.graph_objects as go
-from utils import get_domain_names, get_cluster_interpretation
+from utils import (
+    get_domain_names, get_cluster_interpretation, get_competency_columns, get_domain_mapping,
+    get_overall_domain_means, get_domain_index, average_by_domain, DATAFRAME_HASH_FUNCS
+)
+
+
+@st.cache_data(show_spinner=False, hash_funcs=DATAFRAME_HASH_FUNCS)
+def _cluster_summary(df):
+    # Per-cluster competency means and sizes, so a cluster click needs no row filtering
+    grouped = df.groupby('Cluster', observed=True)
+    return grouped[get_competency_columns(df)].mean(), grouped.size()
+
+
+@st.cache_data(show_spinner=False)
+def _build_domain_fig(domains, cluster_scores, overall_scores):
+    # Keyed on the plotted values, so revisiting a cluster reuses its figure
+    fig_domain = go.Figure()
+    fig_domain.add_trace(go.Bar(
+        name='Cluster Average',
+        x=domains,
+        y=cluster_scores,
+        marker_color='#1E88E5'
+    ))
+    fig_domain.add_trace(go.Bar(
+        name='Overall Average',
+        x=domains,
+        y=overall_scores,
+        marker_color='#90CAF9'
+    ))
+    fig_domain.update_layout(
+        title="Training Needs by Domain Comparison",
+        xaxis_title="Competency Domain",
+        yaxis_title="Average Training Need Rating (1=No Need, 5=Urgent Need)",
+        barmode='group',
+        yaxis=dict(range=[1, 5]),
+        height=500,
+        font=dict(size=12),
+        title_font=dict(size=16, color='#0D47A1')
+    )
+    return fig_domain
+
+
+def _select_cluster(cluster):
+    # Runs before the click's rerun, which stays scoped to the page fragment
+    st.session_state.selected_cluster = cluster
 
 
 def show_cluster_profiles(df):
     st.header("🔍 Cluster Profiles & Analysis")
+    competency_cols = get_competency_columns(df)
+    domain_mapping = get_domain_mapping(df)
+    cluster_mean_table, cluster_sizes = _cluster_summary(df)
+    # Grouped sizes are already indexed by the sorted cluster ids
+    clusters = list(cluster_sizes.index)
     
     if 'selected_cluster' not in st.session_state:
-        st.session_state.selected_cluster = sorted(df['Cluster'].unique())[0]
+        st.session_state.selected_cluster = clusters[0]
     
     st.markdown("**Select Cluster:**")
-    clusters = sorted(df['Cluster'].unique())
     cols = st.columns(len(clusters))
     
     for i, cluster in enumerate(clusters):
         with cols[i]:
-            if st.button(
+            st.button(
                 f"Cluster {cluster}",
                 key=f"cluster_btn_{cluster}",
                 use_container_width=True,
-                type="primary" if st.session_state.selected_cluster == cluster else "secondary"
-            ):
-                st.session_state.selected_cluster = cluster
-                st.rerun()
+                type="primary" if st.session_state.selected_cluster == cluster else "secondary",
+                on_click=_select_cluster,
+                args=(cluster,)
+            )
     
     selected_cluster = st.session_state.selected_cluster
-    cluster_data = df[df['Cluster'] == selected_cluster]
+    # Per-competency means of the selected cluster, reused for every summary below
+    cluster_means = cluster_mean_table.loc[selected_cluster]
     
     st.markdown("---")
     
@@ -35,23 +84,21 @@ def show_cluster_profiles(df):
     st.info(f"**Cluster {selected_cluster} Interpretation:** {interpretation}")
     
     st.markdown("**Key Characteristics:**")
-    competency_cols = [col for col in cluster_data.columns if col.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.', '11.', '12.', '13.'))]
     if competency_cols:
-        avg_rating = cluster_data[competency_cols].mean().mean()
+        avg_rating = cluster_means.mean()
         st.write(f"**Avg Training Need Rating:** {avg_rating:.2f}")
     
     st.divider()
     
-    st.metric("Participants", len(cluster_data))
+    st.metric("Participants", int(cluster_sizes[selected_cluster]))
     
     st.divider()
     
     st.subheader("Training Needs Analysis by Domain")
     
-    competency_cols = [col for col in cluster_data.columns if col.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.', '11.', '12.', '13.'))]
     if len(competency_cols) > 0:
         st.markdown("**Key Competency Highlights:**")
-        top_needs = cluster_data[competency_cols].mean().sort_values(ascending=False).head(5)
+        top_needs = cluster_means.sort_values(ascending=False).head(5)
         st.write("**Highest Training Needs (Top 5):**")
         for comp, rating in top_needs.items():
             comp_name = comp.split('. ', 1)[1] if '. ' in comp else comp
@@ -64,18 +111,14 @@ def show_cluster_profiles(df):
     
     st.divider()
     
-    domain_mapping = {}
-    for col in df.columns:
-        if col.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.', '11.', '12.', '13.')):
-            domain_num = col.split('.')[0]
-            if domain_num not in domain_mapping:
-                domain_mapping[domain_num] = []
-            domain_mapping[domain_num].append(col)
+    # Domain average = mean of its competency means, the same computation as the overall side
+    cluster_by_domain = average_by_domain(cluster_means, get_domain_index(df))
+    overall_by_domain = get_overall_domain_means(df)
     
     domain_avgs = {}
-    for domain, cols in domain_mapping.items():
-        cluster_avg = cluster_data[cols].mean().mean()
-        overall_avg = df[cols].mean().mean()
+    for domain in domain_mapping:
+        cluster_avg = float(cluster_by_domain[int(domain)])
+        overall_avg = overall_by_domain[domain]
         domain_avgs[domain] = {
             'cluster_avg': cluster_avg,
             'overall_avg': overall_avg,
@@ -87,29 +130,7 @@ def show_cluster_profiles(df):
     cluster_scores = [domain_avgs[d]['cluster_avg'] for d in sorted(domain_mapping.keys(), key=int)]
     overall_scores = [domain_avgs[d]['overall_avg'] for d in sorted(domain_mapping.keys(), key=int)]
     
-    fig_domain = go.Figure()
-    fig_domain.add_trace(go.Bar(
-        name='Cluster Average',
-        x=domains,
-        y=cluster_scores,
-        marker_color='#1E88E5'
-    ))
-    fig_domain.add_trace(go.Bar(
-        name='Overall Average',
-        x=domains,
-        y=overall_scores,
-        marker_color='#90CAF9'
-    ))
-    fig_domain.update_layout(
-        title="Training Needs by Domain Comparison",
-        xaxis_title="Competency Domain",
-        yaxis_title="Average Training Need Rating (1=No Need, 5=Urgent Need)",
-        barmode='group',
-        yaxis=dict(range=[1, 5]),
-        height=500,
-        font=dict(size=12),
-        title_font=dict(size=16, color='#0D47A1')
-    )
+    fig_domain = _build_domain_fig(tuple(domains), tuple(cluster_scores), tuple(overall_scores))
     st.plotly_chart(fig_domain, use_container_width=True)
     
     st.caption("Rating Scale: 1=No Need, 2=Low Need, 3=Moderate Need, 4=High Need, 5=Urgent Need")
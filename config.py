@@ -14,6 +14,7 @@ PASSWORD_MIN_LENGTH = 8
 USERNAME_MIN_LENGTH = 3
 USERNAME_MAX_LENGTH = 20
 SESSION_TIMEOUT_MINUTES = 60
+MAX_FAILED_ATTEMPTS = 5
 
 # Default Admin Account
 DEFAULT_ADMIN_USERNAME = "administrator"
@@ -21,7 +22,10 @@ DEFAULT_ADMIN_PASSWORD = "admin123"  # Should be changed in production
 
 # File Paths
 DATA_FILE = "clustering_results.xlsx"
+DATA_CACHE_FILE = DATA_FILE + ".parquet"  # Prepared copy of DATA_FILE, rebuilt when stale
+MODEL_CACHE_FILE = DATA_FILE + ".model.joblib"  # Fitted clustering model, refit when stale
 USERS_FILE = "users.json"
+APP_CSS_FILE = os.path.join("static", "app.css")
 
 # User Roles
 ROLE_ADMIN = "admin"
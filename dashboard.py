@@ -1,168 +1,205 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
+from functools import lru_cache
 import plotly.express as px
+import plotly.graph_objects as go
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
-from utils import get_cluster_interpretation
+from utils import get_cluster_interpretation, get_cluster_counts
 
 
-def show_dashboard(df):
-    st.header("📈 Overview Dashboard")
+_DASHBOARD_CSS = """
+    <style>
+    .cluster-card {
+        background: linear-gradient(135deg, #ffffff 0%, #f5f5f5 100%);
+        border-radius: 16px;
+        padding: 1.5rem;
+        margin-bottom: 1.5rem;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+        border-left: 5px solid;
+        transition: all 0.3s ease;
+        position: relative;
+        overflow: hidden;
+    }
     
-    col1, col2 = st.columns(2)
+    .cluster-card:hover {
+        transform: translateY(-4px);
+        box-shadow: 0 8px 20px rgba(0,0,0,0.15);
+    }
     
-    with col1:
-        st.metric("Total Participants", len(df))
+    .cluster-card::before {
+        content: '';
+        position: absolute;
+        top: 0;
+        right: 0;
+        width: 100px;
+        height: 100px;
+        background: radial-gradient(circle, rgba(0,0,0,0.03) 0%, transparent 70%);
+        border-radius: 50%;
+        transform: translate(30px, -30px);
+    }
     
-    with col2:
-        st.metric("Number of Clusters", df['Cluster'].nunique())
+    .cluster-header {
+        display: flex;
+        align-items: center;
+        justify-content: space-between;
+        margin-bottom: 1rem;
+        padding-bottom: 0.75rem;
+        border-bottom: 2px solid rgba(0,0,0,0.05);
+        flex-wrap: wrap;
+    }
     
-    st.divider()
+    .cluster-title {
+        font-size: 1.5rem;
+        font-weight: 700;
+        margin: 0;
+        display: flex;
+        align-items: center;
+        gap: 0.5rem;
+        flex-wrap: wrap;
+    }
     
-    st.markdown('<h2 style="color: #0D47A1; margin-bottom: 1.5rem; text-align: center; word-wrap: break-word;">📋 Cluster Interpretations</h2>', unsafe_allow_html=True)
+    .cluster-badge {
+        display: inline-block;
+        padding: 0.35rem 0.85rem;
+        border-radius: 20px;
+        font-size: 0.85rem;
+        font-weight: 600;
+        margin-left: 0.5rem;
+        box-shadow: 0 2px 6px rgba(0,0,0,0.1);
+    }
     
-    # Enhanced styling for cluster interpretations with mobile responsiveness
-    st.markdown("""
-        <style>
+    .cluster-profile {
+        font-size: 1.1rem;
+        font-weight: 600;
+        color: #424242;
+        margin-bottom: 0.75rem;
+        padding: 0.5rem 0;
+        word-wrap: break-word;
+    }
+    
+    .cluster-description {
+        font-size: 1rem;
+        line-height: 1.8;
+        color: #555;
+        text-align: justify;
+        padding: 0.5rem 0;
+        word-wrap: break-word;
+    }
+    
+    .cluster-0 { border-left-color: #4CAF50; }
+    .cluster-0 .cluster-badge { background: #4CAF50; color: white; }
+    
+    .cluster-1 { border-left-color: #2196F3; }
+    .cluster-1 .cluster-badge { background: #2196F3; color: white; }
+    
+    .cluster-2 { border-left-color: #FF9800; }
+    .cluster-2 .cluster-badge { background: #FF9800; color: white; }
+    
+    .cluster-icon {
+        font-size: 2rem;
+        margin-right: 0.5rem;
+    }
+    
+    /* Mobile responsive */
+    @media (max-width: 768px) {
         .cluster-card {
-            background: linear-gradient(135deg, #ffffff 0%, #f5f5f5 100%);
-            border-radius: 16px;
-            padding: 1.5rem;
-            margin-bottom: 1.5rem;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-            border-left: 5px solid;
-            transition: all 0.3s ease;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        .cluster-card:hover {
-            transform: translateY(-4px);
-            box-shadow: 0 8px 20px rgba(0,0,0,0.15);
-        }
-        
-        .cluster-card::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            right: 0;
-            width: 100px;
-            height: 100px;
-            background: radial-gradient(circle, rgba(0,0,0,0.03) 0%, transparent 70%);
-            border-radius: 50%;
-            transform: translate(30px, -30px);
-        }
-        
-        .cluster-header {
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            margin-bottom: 1rem;
-            padding-bottom: 0.75rem;
-            border-bottom: 2px solid rgba(0,0,0,0.05);
-            flex-wrap: wrap;
+            padding: 1rem;
+            border-radius: 12px;
         }
         
         .cluster-title {
-            font-size: 1.5rem;
-            font-weight: 700;
-            margin: 0;
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-            flex-wrap: wrap;
-        }
-        
-        .cluster-badge {
-            display: inline-block;
-            padding: 0.35rem 0.85rem;
-            border-radius: 20px;
-            font-size: 0.85rem;
-            font-weight: 600;
-            margin-left: 0.5rem;
-            box-shadow: 0 2px 6px rgba(0,0,0,0.1);
+            font-size: 1.25rem;
         }
         
         .cluster-profile {
-            font-size: 1.1rem;
-            font-weight: 600;
-            color: #424242;
-            margin-bottom: 0.75rem;
-            padding: 0.5rem 0;
-            word-wrap: break-word;
+            font-size: 1rem;
         }
         
         .cluster-description {
-            font-size: 1rem;
-            line-height: 1.8;
-            color: #555;
-            text-align: justify;
-            padding: 0.5rem 0;
-            word-wrap: break-word;
+            font-size: 0.9rem;
+            line-height: 1.6;
         }
         
-        .cluster-0 { border-left-color: #4CAF50; }
-        .cluster-0 .cluster-badge { background: #4CAF50; color: white; }
-        
-        .cluster-1 { border-left-color: #2196F3; }
-        .cluster-1 .cluster-badge { background: #2196F3; color: white; }
-        
-        .cluster-2 { border-left-color: #FF9800; }
-        .cluster-2 .cluster-badge { background: #FF9800; color: white; }
-        
         .cluster-icon {
-            font-size: 2rem;
-            margin-right: 0.5rem;
+            font-size: 1.5rem;
         }
         
-        /* Mobile responsive */
-        @media (max-width: 768px) {
-            .cluster-card {
-                padding: 1rem;
-                border-radius: 12px;
-            }
-            
-            .cluster-title {
-                font-size: 1.25rem;
-            }
-            
-            .cluster-profile {
-                font-size: 1rem;
-            }
-            
-            .cluster-description {
-                font-size: 0.9rem;
-                line-height: 1.6;
-            }
-            
-            .cluster-icon {
-                font-size: 1.5rem;
-            }
-            
-            .cluster-header {
-                flex-direction: column;
-                align-items: flex-start;
-            }
+        .cluster-header {
+            flex-direction: column;
+            align-items: flex-start;
+        }
+    }
+    
+    @media (max-width: 480px) {
+        .cluster-card {
+            padding: 0.75rem;
         }
         
-        @media (max-width: 480px) {
-            .cluster-card {
-                padding: 0.75rem;
-            }
-            
-            .cluster-title {
-                font-size: 1.1rem;
-            }
-            
-            .cluster-badge {
-                font-size: 0.75rem;
-                padding: 0.25rem 0.5rem;
-            }
+        .cluster-title {
+            font-size: 1.1rem;
+        }
+        
+        .cluster-badge {
+            font-size: 0.75rem;
+            padding: 0.25rem 0.5rem;
         }
-        </style>
-    """, unsafe_allow_html=True)
+    }
+    </style>
+"""
+
+
+@st.cache_data(show_spinner=False)
+def _compute_pca(X: np.ndarray):
+    # Keyed on the feature matrix bytes, so reruns skip the scaler and SVD
+    X_scaled = StandardScaler().fit_transform(X)
+    # Only two components are needed, so a randomized SVD beats the full decomposition
+    pca = PCA(n_components=2, svd_solver='randomized', random_state=0)
+    principal_components = pca.fit_transform(X_scaled)
+    return principal_components, pca.explained_variance_ratio_
+
+
+@lru_cache(maxsize=32)
+def _split_interpretation(interpretation: str) -> tuple:
+    # Interpretations are static config strings, so each is parsed once per process
+    if "**" in interpretation and ":" in interpretation:
+        # Format: **Title**: Description
+        parts = interpretation.split("**", 2)
+        if len(parts) >= 3:
+            profile_title = parts[1].strip()
+            description = parts[2].replace(":", "").strip()
+        else:
+            profile_title = "Cluster Profile"
+            description = interpretation.replace("**", "").strip()
+    elif ":" in interpretation:
+        profile_title = interpretation.split(":")[0].replace("**", "").strip()
+        description = interpretation.split(":", 1)[1].replace("**", "").strip()
+    else:
+        profile_title = "Cluster Profile"
+        description = interpretation.replace("**", "").strip()
+    return profile_title, description
+
+
+def show_dashboard(df):
+    st.header("📈 Overview Dashboard")
+    # One cached pass over the Cluster column feeds the metric, the cards and both charts
+    cluster_counts = get_cluster_counts(df)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.metric("Total Participants", len(df))
+    
+    with col2:
+        st.metric("Number of Clusters", len(cluster_counts))
+    
+    st.divider()
+    
+    st.markdown('<h2 style="color: #0D47A1; margin-bottom: 1.5rem; text-align: center; word-wrap: break-word;">📋 Cluster Interpretations</h2>', unsafe_allow_html=True)
+    
+    # Enhanced styling for cluster interpretations with mobile responsiveness
+    st.markdown(_DASHBOARD_CSS, unsafe_allow_html=True)
     
-    cluster_counts = df['Cluster'].value_counts().sort_index()
     cluster_icons = {
         0: "🌟",
         1: "📚",
@@ -175,8 +212,9 @@ def show_dashboard(df):
         2: ("#FF9800", "Low Engagement - Traditional Methods")
     }
     
-    # Display clusters in a grid layout
-    clusters = sorted(df['Cluster'].unique())
+    # Display clusters in a grid layout, sent to the browser as a single element
+    clusters = list(cluster_counts.index)
+    cards = []
     
     for cluster_id in clusters:
         cluster_size = cluster_counts[cluster_id]
@@ -184,24 +222,9 @@ def show_dashboard(df):
         icon = cluster_icons.get(cluster_id, "📊")
         color, tag = cluster_colors.get(cluster_id, ("#666", "Cluster"))
         
-        # Extract profile title from interpretation
-        if "**" in interpretation and ":" in interpretation:
-            # Format: **Title**: Description
-            parts = interpretation.split("**", 2)
-            if len(parts) >= 3:
-                profile_title = parts[1].strip()
-                description = parts[2].replace(":", "").strip()
-            else:
-                profile_title = "Cluster Profile"
-                description = interpretation.replace("**", "").strip()
-        elif ":" in interpretation:
-            profile_title = interpretation.split(":")[0].replace("**", "").strip()
-            description = interpretation.split(":", 1)[1].replace("**", "").strip()
-        else:
-            profile_title = "Cluster Profile"
-            description = interpretation.replace("**", "").strip()
+        profile_title, description = _split_interpretation(interpretation)
         
-        st.markdown(f'''
+        cards.append(f'''
             <div class="cluster-card cluster-{cluster_id}">
                 <div class="cluster-header">
                     <div>
@@ -216,7 +239,9 @@ def show_dashboard(df):
                 <div class="cluster-profile">Profile: {profile_title}</div>
                 <div class="cluster-description">{description}</div>
             </div>
-        ''', unsafe_allow_html=True)
+        ''')
+    
+    st.markdown(''.join(cards), unsafe_allow_html=True)
     
     st.divider()
     
@@ -224,7 +249,6 @@ def show_dashboard(df):
     
     with col1:
         st.subheader("Cluster Distribution")
-        cluster_counts = df['Cluster'].value_counts().sort_index()
         fig_pie = px.pie(
             values=cluster_counts.values,
             names=[f"Cluster {i}" for i in cluster_counts.index],
@@ -247,33 +271,31 @@ def show_dashboard(df):
         feature_cols = [col for col in df.columns if col not in ['Cluster']]
         
         if len(feature_cols) > 0:
-            X = df[feature_cols].values
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X)
+            principal_components, explained_variance_ratio = _compute_pca(df[feature_cols].to_numpy(dtype=np.float32))
             
-            pca = PCA(n_components=2)
-            principal_components = pca.fit_transform(X_scaled)
+            # WebGL traces fed float32/int32 arrays, which plotly sends as base64 typed arrays
+            points = principal_components.astype(np.float32, copy=False)
+            point_clusters = df['Cluster'].to_numpy(dtype=np.int32)
+            palette = ['#4CAF50', '#2196F3', '#FF9800']
             
-            pca_df = pd.DataFrame(
-                principal_components,
-                columns=['PC1', 'PC2']
-            )
-            pca_df['Cluster'] = df['Cluster'].values
-            
-            fig_scatter = px.scatter(
-                pca_df,
-                x='PC1',
-                y='PC2',
-                color='Cluster',
-                color_discrete_sequence=['#4CAF50', '#2196F3', '#FF9800'],
-                title="2D PCA Visualization of Clusters",
-                labels={"PC1": f"Principal Component 1 ({pca.explained_variance_ratio_[0]:.2%})",
-                       "PC2": f"Principal Component 2 ({pca.explained_variance_ratio_[1]:.2%})"}
-            )
+            fig_scatter = go.Figure()
+            for i, cluster_id in enumerate(clusters):
+                in_cluster = point_clusters == cluster_id
+                fig_scatter.add_trace(go.Scattergl(
+                    x=points[in_cluster, 0],
+                    y=points[in_cluster, 1],
+                    mode='markers',
+                    name=str(cluster_id),
+                    marker=dict(color=palette[i % len(palette)])
+                ))
             fig_scatter.update_layout(
+                title="2D PCA Visualization of Clusters",
+                xaxis_title=f"Principal Component 1 ({explained_variance_ratio[0]:.2%})",
+                yaxis_title=f"Principal Component 2 ({explained_variance_ratio[1]:.2%})",
+                legend_title_text="Cluster",
                 font=dict(size=12),
                 title_font=dict(size=16, color='#0D47A1')
             )
             st.plotly_chart(fig_scatter, use_container_width=True)
             
-            st.info(f"PCA explains {sum(pca.explained_variance_ratio_):.2%} of the variance")
\ No newline at end of file
+            st.info(f"PCA explains {sum(explained_variance_ratio):.2%} of the variance")
\ No newline at end of file
@@ -1,5 +1,10 @@
 import streamlit as st
-from utils import get_domain_names, get_cluster_interpretation
+import numpy as np
+from utils import (
+    get_domain_names, get_cluster_interpretation, get_competency_columns, get_domain_mapping,
+    get_domain_index, average_by_domain, get_training_priorities, get_overall_domain_means,
+    get_cluster_counts
+)
 
 
 def show_recommendations(df):
@@ -8,11 +13,12 @@ def show_recommendations(df):
     
     domain_names = get_domain_names()
     
+    clusters = list(get_cluster_counts(df).index)
+    
     if 'selected_cluster_rec' not in st.session_state:
-        st.session_state.selected_cluster_rec = sorted(df['Cluster'].unique())[0]
+        st.session_state.selected_cluster_rec = clusters[0]
     
     st.markdown("**Select Cluster:**")
-    clusters = sorted(df['Cluster'].unique())
     cols = st.columns(len(clusters))
     
     for i, cluster in enumerate(clusters):
@@ -35,44 +41,42 @@ def show_recommendations(df):
     st.info(f"**Cluster {selected_cluster} Profile:** {interpretation}")
     st.divider()
     
-    domain_mapping = {}
-    for col in df.columns:
-        if col.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.', '11.', '12.', '13.')):
-            domain_num = col.split('.')[0]
-            if domain_num not in domain_mapping:
-                domain_mapping[domain_num] = []
-            domain_mapping[domain_num].append(col)
+    domain_mapping = get_domain_mapping(df)
     
-    recommendations = []
-    for domain, cols in sorted(domain_mapping.items(), key=lambda x: int(x[0])):
-        cluster_avg = cluster_data[cols].mean().mean()
-        overall_avg = df[cols].mean().mean()
-        gap = cluster_avg - overall_avg
-        
-        if gap > 0.3 or cluster_avg >= 3.5:
-            if cluster_avg >= 4.5:
-                priority = 'URGENT'
-            elif cluster_avg >= 4.0:
-                priority = 'HIGH'
-            elif cluster_avg >= 3.5 or gap > 0.5:
-                priority = 'MEDIUM'
-            else:
-                priority = 'LOW'
-            
-            recommendations.append({
-                'domain': domain,
-                'name': domain_names.get(domain, f"Domain {domain}"),
-                'cluster_avg': cluster_avg,
-                'gap': gap,
-                'priority': priority,
-                'competencies': cols
-            })
+    # Dataset-wide domain averages are cached; only the cluster's side is computed here
+    overall_by_domain = get_overall_domain_means(df)
+    
+    # Cluster domain averages: one reduction over all competency columns, then the
+    # column means are averaged per domain over the cached domain index
+    competency_cols = get_competency_columns(df)
+    cluster_means = cluster_data[competency_cols].mean()
+    cluster_by_domain = average_by_domain(cluster_means, get_domain_index(df))
+    
+    domains = sorted(domain_mapping, key=int)
+    cluster_avgs = cluster_by_domain[[int(domain) for domain in domains]]
+    gaps = cluster_avgs - np.array([overall_by_domain[domain] for domain in domains])
+    needs_training, priorities = get_training_priorities(cluster_avgs, gaps)
+    
+    recommendations = [
+        {
+            'domain': domains[i],
+            'name': domain_names.get(domains[i], f"Domain {domains[i]}"),
+            'cluster_avg': float(cluster_avgs[i]),
+            'gap': float(gaps[i]),
+            'priority': str(priorities[i]),
+            'competencies': domain_mapping[domains[i]]
+        }
+        for i in np.flatnonzero(needs_training)
+    ]
     
     if recommendations:
         st.markdown(f"### Recommended Training Programs for Cluster {selected_cluster}")
         st.caption("📋 Based on training need ratings: 1=No Need, 2=Low Need, 3=Moderate Need, 4=High Need, 5=Urgent Need")
         st.markdown("<br>", unsafe_allow_html=True)
         
+        # Per-competency means for the focus areas, looked up instead of recomputed per column
+        overall_means = df[competency_cols].mean()
+        
         recommendations_sorted = sorted(recommendations, key=lambda x: (x['cluster_avg'], x['gap']), reverse=True)
         
         for i, rec in enumerate(recommendations_sorted, 1):
@@ -83,8 +87,8 @@ def show_recommendations(df):
                 
                 comp_needs = []
                 for col in rec['competencies']:
-                    cluster_avg = cluster_data[col].mean()
-                    overall_avg = df[col].mean()
+                    cluster_avg = cluster_means[col]
+                    overall_avg = overall_means[col]
                     comp_needs.append((col, cluster_avg, cluster_avg - overall_avg))
                 
                 comp_needs_sorted = sorted(comp_needs, key=lambda x: x[1], reverse=True)
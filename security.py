@@ -6,22 +6,66 @@ import re
 import secrets
 from typing import Tuple
 
+# scrypt cost parameters for new password hashes (about 16 MB of memory per hash)
+SCRYPT_PREFIX = "scrypt"
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+
+# Input sanitization: HTML tags, then any leftover markup/quote characters
+_TAG_RE = re.compile(r'<[^>]+>')
+_STRIP_CHARS = str.maketrans('', '', '<>"\'')
+
+# Username/password validation
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_]+$')
+_HAS_LETTER_RE = re.compile(r'[a-zA-Z]')
+_HAS_NUMBER_RE = re.compile(r'[0-9]')
+_RESERVED_USERNAMES = frozenset({'admin', 'administrator', 'root', 'system', 'null', 'undefined'})
+
+# HTML escaping in a single pass ('&' is mapped per character, so no double-escaping)
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+    '/': '&#x2F;'
+})
+
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using SHA-256 with salt.
-    For production, consider using bcrypt or argon2.
+    Hash a password using scrypt with a random salt.
     
     Args:
         password: Plain text password
         
     Returns:
-        Hashed password string
+        Hashed password string (format: scrypt$n$r$p$salt$hash)
+    """
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(
+        password.encode('utf-8'), salt=salt,
+        n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=SCRYPT_DKLEN
+    )
+    return f"{SCRYPT_PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash predates the current scrypt parameters.
+    
+    Args:
+        hashed_password: Stored hash
+        
+    Returns:
+        True if the password should be re-hashed with hash_password
     """
-    # Add salt for better security
-    salt = secrets.token_hex(16)
-    salted_password = password + salt
-    return hashlib.sha256(salted_password.encode()).hexdigest() + ":" + salt
+    if not hashed_password or not hashed_password.startswith(SCRYPT_PREFIX + "$"):
+        return True
+    parts = hashed_password.split("$")
+    return parts[1:4] != [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
@@ -30,16 +74,28 @@ def verify_password(password: str, hashed_password: str) -> bool:
     
     Args:
         password: Plain text password to verify
-        hashed_password: Stored hash (format: hash:salt)
+        hashed_password: Stored hash (format: scrypt$n$r$p$salt$hash, or legacy SHA-256 hash:salt)
         
     Returns:
         True if password matches, False otherwise
     """
     try:
+        if hashed_password.startswith(SCRYPT_PREFIX + "$"):
+            _, n, r, p, salt, hash_part = hashed_password.split("$")
+            stored_digest = bytes.fromhex(hash_part)
+            computed_digest = hashlib.scrypt(
+                password.encode('utf-8'), salt=bytes.fromhex(salt),
+                n=int(n), r=int(r), p=int(p), dklen=len(stored_digest)
+            )
+            return secrets.compare_digest(computed_digest, stored_digest)
+        
+        # Legacy salted SHA-256, compared as raw digest bytes
         hash_part, salt = hashed_password.rsplit(":", 1)
-        salted_password = password + salt
-        computed_hash = hashlib.sha256(salted_password.encode()).hexdigest()
-        return secrets.compare_digest(computed_hash, hash_part)
+        stored_digest = bytes.fromhex(hash_part)
+        hasher = hashlib.sha256(password.encode('utf-8'))
+        hasher.update(salt.encode('utf-8'))
+        computed_digest = hasher.digest()
+        return secrets.compare_digest(computed_digest, stored_digest)
     except (ValueError, AttributeError):
         # Handle legacy passwords without salt
         return hashlib.sha256(password.encode()).hexdigest() == hashed_password
@@ -60,9 +116,7 @@ def sanitize_input(text: str, max_length: int = None) -> str:
         return ""
     
     # Remove HTML tags and dangerous characters
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'[<>"\']', '', text)
-    text = text.strip()
+    text = _TAG_RE.sub('', text).translate(_STRIP_CHARS).strip()
     
     # Limit length
     if max_length and len(text) > max_length:
@@ -94,12 +148,11 @@ def validate_username(username: str) -> Tuple[bool, str]:
         return False, "Username must be at most 20 characters"
     
     # Format validation - only alphanumeric and underscore
-    if not re.match(r'^[a-zA-Z0-9_]+$', username):
+    if not _USERNAME_RE.match(username):
         return False, "Username can only contain letters, numbers, and underscores"
     
     # Reserved usernames
-    reserved = ['admin', 'administrator', 'root', 'system', 'null', 'undefined']
-    if username.lower() in reserved:
+    if username.lower() in _RESERVED_USERNAMES:
         return False, "This username is reserved"
     
     return True, ""
@@ -125,8 +178,8 @@ def validate_password(password: str) -> Tuple[bool, str]:
         return False, "Password is too long (maximum 128 characters)"
     
     # Check for at least one letter and one number
-    has_letter = re.search(r'[a-zA-Z]', password)
-    has_number = re.search(r'[0-9]', password)
+    has_letter = _HAS_LETTER_RE.search(password)
+    has_number = _HAS_NUMBER_RE.search(password)
     
     if not has_letter or not has_number:
         return False, "Password must contain at least one letter and one number"
@@ -147,17 +200,5 @@ def escape_html(text: str) -> str:
     if not text:
         return ""
     
-    escape_map = {
-        '&': '&amp;',
-        '<': '&lt;',
-        '>': '&gt;',
-        '"': '&quot;',
-        "'": '&#x27;',
-        '/': '&#x2F;'
-    }
-    
-    for char, escaped in escape_map.items():
-        text = text.replace(char, escaped)
-    
-    return text
+    return text.translate(_HTML_ESCAPE)
 
@@ -2,67 +2,54 @@
 Self Assessment module with improved validation
 """
 import streamlit as st
+import pandas as pd
 import numpy as np
 import logging
 from datetime import datetime
-from utils import get_domain_names, get_clustering_model, predict_cluster, get_cluster_interpretation
+from utils import (
+    get_domain_names, get_clustering_model, predict_cluster, predict_cluster_vector,
+    get_cluster_interpretation, get_competency_columns, get_domain_mapping, get_domain_index,
+    average_by_domain, get_training_priorities, get_overall_domain_means
+)
 from config import (
     MIN_RATING, MAX_RATING
 )
 
 logger = logging.getLogger(__name__)
 
+_ASSESSMENT_CSS = """
+    <style>
+    /* Touch-friendly form elements */
+    .stButton > button {
+        min-height: 44px;
+        font-size: 1rem;
+    }
+    
+    /* Word wrapping for long text */
+    .stMarkdown {
+        word-wrap: break-word;
+    }
+    </style>
+"""
+
 
 def show_self_assessment(df):
     """Display self assessment form and results"""
     # Mobile responsive styling
-    st.markdown("""
-        <style>
-        /* Mobile responsive radio buttons */
-        @media (max-width: 768px) {
-            .stRadio > div {
-                flex-direction: column !important;
-            }
-            
-            .stRadio > div > label {
-                margin-bottom: 0.5rem;
-                padding: 0.75rem;
-                min-height: 44px;
-                display: flex;
-                align-items: center;
-            }
-        }
-        
-        /* Touch-friendly form elements */
-        .stButton > button {
-            min-height: 44px;
-            font-size: 1rem;
-        }
-        
-        /* Word wrapping for long text */
-        .stMarkdown {
-            word-wrap: break-word;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_ASSESSMENT_CSS, unsafe_allow_html=True)
     
     st.markdown("## 📝 Self Assessment")
     st.markdown("Complete this assessment to find your cluster assignment and receive personalized training recommendations.")
     st.markdown("<br>", unsafe_allow_html=True)
     
     try:
-        competency_cols = [col for col in df.columns if col.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.', '11.', '12.', '13.'))]
+        competency_cols = get_competency_columns(df)
         
         if not competency_cols:
             st.error("Error: No competency columns found in the dataset.")
             return
         
-        domain_mapping = {}
-        for col in competency_cols:
-            domain_num = col.split('.')[0]
-            if domain_num not in domain_mapping:
-                domain_mapping[domain_num] = []
-            domain_mapping[domain_num].append(col)
+        domain_mapping = get_domain_mapping(df)
         
         domain_names = get_domain_names()
         
@@ -75,29 +62,32 @@ def show_self_assessment(df):
             st.info("**📊 Rating Scale:** 1 = No Need | 2 = Low Need | 3 = Moderate Need | 4 = High Need | 5 = Urgent Need")
             st.markdown("<br>", unsafe_allow_html=True)
             
-            ratings = {}
-            
+            # One editable table for every competency instead of a radio widget per row
+            form_cols, domain_labels, comp_names = [], [], []
             for domain_num in sorted(domain_mapping.keys(), key=int):
-                domain_cols_list = sorted(domain_mapping[domain_num])
-                domain_name = domain_names.get(domain_num, f"Domain {domain_num}")
-                
-                with st.expander(f"📚 {domain_num}. {domain_name}", expanded=True):
-                    for comp_col in domain_cols_list:
-                        comp_name = comp_col.split('. ', 1)[1] if '. ' in comp_col else comp_col
-                        
-                        st.markdown(f"**{comp_name}**")
-                        
-                        # Use horizontal layout on desktop, vertical on mobile
-                        rating = st.radio(
-                            f"Rate: {comp_name}",
-                            options=list(range(MIN_RATING, MAX_RATING + 1)),
-                            index=0,
-                            key=f"form_{comp_col}",
-                            horizontal=True,
-                            label_visibility="collapsed"
-                        )
-                        ratings[comp_col] = rating
-                        st.markdown("<br>", unsafe_allow_html=True)
+                domain_label = f"{domain_num}. {domain_names.get(domain_num, f'Domain {domain_num}')}"
+                for comp_col in sorted(domain_mapping[domain_num]):
+                    form_cols.append(comp_col)
+                    domain_labels.append(domain_label)
+                    comp_names.append(comp_col.split('. ', 1)[1] if '. ' in comp_col else comp_col)
+            
+            edited = st.data_editor(
+                pd.DataFrame({'Domain': domain_labels, 'Competency': comp_names, 'Rating': MIN_RATING}),
+                column_config={
+                    'Rating': st.column_config.NumberColumn(
+                        "Rating", min_value=MIN_RATING, max_value=MAX_RATING, step=1, required=True
+                    )
+                },
+                disabled=['Domain', 'Competency'],
+                hide_index=True,
+                use_container_width=True,
+                key="assessment_ratings"
+            )
+            # A cleared cell falls back to the lowest rating, the old radio default
+            rating_values = edited['Rating'].fillna(MIN_RATING).clip(MIN_RATING, MAX_RATING).astype(int)
+            ratings = dict(zip(form_cols, rating_values.tolist()))
+            # Form rows are grouped by domain; the model takes competencies in column order
+            col_position = {col: i for i, col in enumerate(competency_cols)}
             
             submitted = st.form_submit_button("Submit Assessment", type="primary")
             
@@ -107,7 +97,11 @@ def show_self_assessment(df):
                 }
                 assessment_data.update(ratings)
                 
+                assessment_vector = np.empty(len(competency_cols), dtype=np.float32)
+                assessment_vector[[col_position[col] for col in form_cols]] = rating_values.to_numpy()
+                
                 st.session_state.assessment_data = assessment_data
+                st.session_state.assessment_vector = assessment_vector
                 st.session_state.assessment_submitted = True
                 
                 st.rerun()
@@ -126,11 +120,15 @@ def show_self_assessment(df):
                 st.rerun()
         
         assessment_data = st.session_state.assessment_data.copy()
+        assessment_vector = st.session_state.get('assessment_vector')
         
         kmeans, scaler, features = get_clustering_model(df)
         
         try:
-            cluster = predict_cluster(assessment_data, kmeans, scaler, features)
+            if assessment_vector is not None and features == competency_cols:
+                cluster = predict_cluster_vector(assessment_vector, kmeans, scaler)
+            else:
+                cluster = predict_cluster(assessment_data, kmeans, scaler, features)
             assessment_data['Cluster'] = cluster
             
             st.success("✅ Assessment submitted successfully!")
@@ -144,32 +142,26 @@ def show_self_assessment(df):
             
             st.subheader("🎯 Your Training Recommendations")
             
-            recommendations = []
+            overall_by_domain = get_overall_domain_means(df)
+            domain_avgs = average_by_domain(
+                [assessment_data[col] for col in competency_cols], get_domain_index(df)
+            )
             
-            for domain_num in sorted(domain_mapping.keys(), key=int):
-                domain_cols_list = domain_mapping[domain_num]
-                domain_ratings = [assessment_data[col] for col in domain_cols_list]
-                domain_avg = np.mean(domain_ratings)
-                overall_avg = df[domain_cols_list].mean().mean()
-                gap = domain_avg - overall_avg
-                
-                if domain_avg >= 3.5 or gap > 0.3:
-                    if domain_avg >= 4.5:
-                        priority = 'URGENT'
-                    elif domain_avg >= 4.0:
-                        priority = 'HIGH'
-                    elif domain_avg >= 3.5 or gap > 0.5:
-                        priority = 'MEDIUM'
-                    else:
-                        priority = 'LOW'
-                    
-                    recommendations.append({
-                        'domain': domain_num,
-                        'name': domain_names.get(domain_num, f"Domain {domain_num}"),
-                        'avg_rating': domain_avg,
-                        'gap': gap,
-                        'priority': priority
-                    })
+            domains = sorted(domain_mapping.keys(), key=int)
+            avg_ratings = domain_avgs[[int(domain_num) for domain_num in domains]]
+            gaps = avg_ratings - np.array([overall_by_domain[domain_num] for domain_num in domains])
+            needs_training, priorities = get_training_priorities(avg_ratings, gaps)
+            
+            recommendations = [
+                {
+                    'domain': domains[i],
+                    'name': domain_names.get(domains[i], f"Domain {domains[i]}"),
+                    'avg_rating': float(avg_ratings[i]),
+                    'gap': float(gaps[i]),
+                    'priority': str(priorities[i])
+                }
+                for i in np.flatnonzero(needs_training)
+            ]
             
             if recommendations:
                 priority_order = {'URGENT': 4, 'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
@@ -0,0 +1,29 @@
+import pandas as pd
+
+from utils import dataframe_cache_key, _stamp_source_fingerprint
+
+
+def _stamped_frame():
+    df = pd.DataFrame({'a': [1.0, 2.0, None], 'b': [4, 5, 6]})
+    _stamp_source_fingerprint(df, 123)
+    return df
+
+
+def test_stamped_frame_keys_on_its_fingerprint():
+    df = _stamped_frame()
+    assert dataframe_cache_key(df) == ((123, (3, 2)), ('a', 'b'))
+
+
+def test_derived_frames_do_not_reuse_the_fingerprint():
+    df = _stamped_frame()
+    edited = df.copy()
+    edited.loc[0, 'b'] = 40
+    for derived in (df.fillna(0), df.astype(float), df * 2, edited):
+        assert derived.attrs  # pandas carries attrs over to the derived frame
+        assert dataframe_cache_key(derived) != dataframe_cache_key(df)
+
+
+def test_unstamped_frames_key_on_their_contents():
+    df = pd.DataFrame({'a': [1, 2, 3]})
+    assert dataframe_cache_key(df) == dataframe_cache_key(df.copy())
+    assert dataframe_cache_key(df) != dataframe_cache_key(df + 1)
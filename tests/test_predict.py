@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import StandardScaler
+
+from utils import predict_cluster, predict_clusters
+
+FEATURES = [f"{domain}.{item}. Competency {domain}.{item}" for domain in range(1, 5) for item in range(1, 4)]
+
+
+@pytest.fixture(scope='module')
+def model():
+    rng = np.random.default_rng(0)
+    X = rng.integers(1, 6, size=(300, len(FEATURES))).astype(np.float64)
+    scaler = StandardScaler().fit(X)
+    kmeans = KMeans(n_clusters=3, random_state=42, n_init=1).fit(scaler.transform(X))
+    return kmeans, scaler
+
+
+def _reference(ratings, kmeans, scaler):
+    # What the models predict on clamped ratings, without the absorbed-centroid shortcut
+    ratings = np.clip(np.asarray(ratings, dtype=np.float64), 1, 5)
+    return kmeans.predict(scaler.transform(ratings))
+
+
+def test_matches_the_fitted_model_on_valid_ratings(model):
+    kmeans, scaler = model
+    ratings = np.random.default_rng(1).uniform(1, 5, size=(500, len(FEATURES)))
+    batch = pd.DataFrame(ratings, columns=FEATURES)
+    np.testing.assert_array_equal(predict_clusters(batch, kmeans, scaler, FEATURES), _reference(ratings, kmeans, scaler))
+
+
+def test_out_of_range_ratings_are_clamped(model):
+    kmeans, scaler = model
+    ratings = np.random.default_rng(2).uniform(-3, 9, size=(200, len(FEATURES)))
+    batch = pd.DataFrame(ratings, columns=FEATURES)
+    np.testing.assert_array_equal(predict_clusters(batch, kmeans, scaler, FEATURES), _reference(ratings, kmeans, scaler))
+
+
+def test_numeric_strings_are_parsed(model):
+    kmeans, scaler = model
+    ratings = np.random.default_rng(3).integers(1, 6, size=(20, len(FEATURES)))
+    batch = [{feature: str(value) for feature, value in zip(FEATURES, row)} for row in ratings]
+    np.testing.assert_array_equal(predict_clusters(batch, kmeans, scaler, FEATURES), _reference(ratings, kmeans, scaler))
+
+
+def test_missing_and_invalid_ratings_both_take_the_training_mean(model):
+    kmeans, scaler = model
+    row = dict(zip(FEATURES, [5] * len(FEATURES)))
+    missing = {feature: value for feature, value in row.items() if not feature.startswith('2.')}
+    none_values = {**row, **{feature: None for feature in FEATURES if feature.startswith('2.')}}
+    invalid = {**row, **{feature: 'n/a' for feature in FEATURES if feature.startswith('2.')}}
+
+    expected_ratings = np.array([[scaler.mean_[i] if f.startswith('2.') else 5 for i, f in enumerate(FEATURES)]])
+    expected = _reference(expected_ratings, kmeans, scaler)[0]
+
+    result = predict_clusters([missing, none_values, invalid], kmeans, scaler, FEATURES)
+    assert result.tolist() == [expected] * 3
+
+
+def test_dataframe_and_dict_batches_agree(model):
+    kmeans, scaler = model
+    ratings = np.random.default_rng(4).integers(1, 6, size=(30, len(FEATURES)))
+    # Extra and reordered columns are ignored; features are looked up by name
+    batch = pd.DataFrame(ratings, columns=FEATURES).assign(Extra='x')[['Extra'] + FEATURES[::-1]]
+    records = batch.to_dict('records')
+    np.testing.assert_array_equal(
+        predict_clusters(batch, kmeans, scaler, FEATURES),
+        predict_clusters(records, kmeans, scaler, FEATURES),
+    )
+
+
+def test_predict_cluster_returns_a_plain_int(model):
+    kmeans, scaler = model
+    row = dict(zip(FEATURES, [1, 2, 3, 4, 5, 1, 2, 3, 4, 5, 1, 2]))
+    cluster = predict_cluster(row, kmeans, scaler, FEATURES)
+    assert type(cluster) is int
+    assert cluster == _reference([list(row.values())], kmeans, scaler)[0]
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+from utils import sanitize_df_for_arrow, _INFER_SAMPLE_ROWS
+
+
+def _object_column(values):
+    return pd.DataFrame({'col': pd.Series(values, dtype=object)})
+
+
+def test_numeric_strings_are_cleaned_and_converted():
+    df = _object_column([' 1,200 ', '$3', '50%', '7.5'])
+    result = sanitize_df_for_arrow(df)['col']
+    assert pd.api.types.is_float_dtype(result.dtype)
+    assert result.tolist() == [1200.0, 3.0, 50.0, 7.5]
+
+
+def test_mixed_column_keeps_majority_numeric_and_drops_the_rest():
+    df = _object_column(['1', '2', 'n/a', '4'])
+    result = sanitize_df_for_arrow(df)['col']
+    assert pd.api.types.is_float_dtype(result.dtype)
+    assert result.isna().tolist() == [False, False, True, False]
+
+
+def test_mostly_text_column_stays_object():
+    df = _object_column(['alpha', 'beta', '3', 'gamma'])
+    result = sanitize_df_for_arrow(df)['col']
+    assert result.dtype == object
+    assert result.tolist() == ['alpha', 'beta', '3', 'gamma']
+
+
+def test_late_invalid_values_are_not_coerced_away():
+    # Numeric for the whole sampled head, text for most of the column
+    values = ['1'] * _INFER_SAMPLE_ROWS + ['x'] * (2 * _INFER_SAMPLE_ROWS)
+    result = sanitize_df_for_arrow(_object_column(values))['col']
+    assert result.dtype == object
+    assert result.tolist() == values
+
+
+def test_late_invalid_dates_are_not_coerced_away():
+    values = ['2024-01-01'] * _INFER_SAMPLE_ROWS + ['x'] * (2 * _INFER_SAMPLE_ROWS)
+    result = sanitize_df_for_arrow(_object_column(values))['col']
+    assert result.dtype == object
+    assert result.tolist() == values
+
+
+def test_leading_text_does_not_block_numeric_conversion():
+    values = ['abc'] * 20 + ['1'] * 30
+    result = sanitize_df_for_arrow(_object_column(values))['col']
+    assert pd.api.types.is_float_dtype(result.dtype)
+    assert result.isna().sum() == 20
+    assert result.iloc[20:].eq(1.0).all()
+
+
+def test_leading_nulls_do_not_block_numeric_conversion():
+    values = [None] * _INFER_SAMPLE_ROWS + ['1'] * (2 * _INFER_SAMPLE_ROWS)
+    result = sanitize_df_for_arrow(_object_column(values))['col']
+    assert pd.api.types.is_float_dtype(result.dtype)
+    assert result.isna().sum() == _INFER_SAMPLE_ROWS
+    assert result.iloc[_INFER_SAMPLE_ROWS:].eq(1.0).all()
+
+
+def test_leading_nulls_do_not_block_date_conversion():
+    values = [None] * _INFER_SAMPLE_ROWS + ['2024-01-01'] * (2 * _INFER_SAMPLE_ROWS)
+    result = sanitize_df_for_arrow(_object_column(values))['col']
+    assert pd.api.types.is_datetime64_any_dtype(result.dtype)
+    assert result.isna().sum() == _INFER_SAMPLE_ROWS
+
+
+def test_date_strings_are_converted():
+    df = _object_column(['2024-01-01', '2024-02-15', 'unknown'])
+    result = sanitize_df_for_arrow(df)['col']
+    assert pd.api.types.is_datetime64_any_dtype(result.dtype)
+    assert result.isna().tolist() == [False, False, True]
+
+
+def test_whole_number_floats_become_nullable_integers():
+    df = pd.DataFrame({'col': [1.0, np.nan, 3.0]})
+    result = sanitize_df_for_arrow(df)['col']
+    assert result.dtype == 'Int64'
+    assert result.isna().tolist() == [False, True, False]
+    assert result.dropna().tolist() == [1, 3]
+
+
+def test_fractional_infinite_and_out_of_range_floats_stay_float():
+    df = pd.DataFrame({
+        'fraction': [1.0, 2.5, 3.0],
+        'infinite': [1.0, np.inf, 3.0],
+        'huge': [1.0, 1e20, 3.0],
+        'empty': [np.nan, np.nan, np.nan],
+    })
+    result = sanitize_df_for_arrow(df)
+    for col in df.columns:
+        assert result[col].dtype == np.float64
+    pd.testing.assert_frame_equal(result, df)
+
+
+def test_numeric_total_column_is_converted_like_any_other():
+    df = pd.DataFrame({'Total': pd.Series(['1,000', '250', None], dtype=object)})
+    result = sanitize_df_for_arrow(df)['Total']
+    assert result.dtype == np.float64
+    assert result.tolist()[:2] == [1000.0, 250.0]
+
+
+def test_mostly_text_total_column_keeps_its_numbers_as_integers():
+    df = pd.DataFrame({'Total': pd.Series(['1,000', 'x', 'y', 'z'], dtype=object)})
+    result = sanitize_df_for_arrow(df)['Total']
+    assert result.dtype == 'Int64'
+    assert result.isna().tolist() == [False, True, True, True]
+    assert result.iloc[0] == 1000
+
+
+def test_input_frame_is_left_unchanged():
+    df = pd.DataFrame({'num': pd.Series(['1', '2'], dtype=object), 'whole': [1.0, 2.0]})
+    original = df.copy()
+    sanitize_df_for_arrow(df)
+    pd.testing.assert_frame_equal(df, original)
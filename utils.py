@@ -5,19 +5,47 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
+import re
+import joblib
+import sklearn
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
 from sklearn.decomposition import PCA
+from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 import logging
 import warnings
 from config import (
-    DATA_FILE, DOMAIN_NAMES, CLUSTER_INTERPRETATIONS,
+    DATA_FILE, DATA_CACHE_FILE, MODEL_CACHE_FILE, DOMAIN_NAMES, CLUSTER_INTERPRETATIONS,
     NUM_CLUSTERS, CLUSTER_RANDOM_STATE
 )
 
 warnings.filterwarnings('ignore')
 logger = logging.getLogger(__name__)
 
+# Competency columns are prefixed with their domain number (1-13), e.g. "5. Using LMS"
+_DOMAIN_IDS = frozenset(str(i) for i in range(1, 14))
+
+# Thousands separators, currency and percent signs stripped before numeric coercion
+_NUMBER_JUNK_RE = re.compile(r'[,$%]')
+
+# Rows inspected by sanitize_df_for_arrow when choosing a column's dtype
+_INFER_SAMPLE_ROWS = 1000
+
+# DataFrame.attrs key holding the fingerprint of the file a frame was loaded from
+SOURCE_FINGERPRINT_ATTR = 'source_fingerprint'
+
+
+def _to_number(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s.str.replace(_NUMBER_JUNK_RE, '', regex=True), errors='coerce')
+
+
+def _mostly_valid(converted: pd.Series) -> bool:
+    # A conversion is kept when at least half of the values survived it
+    return converted.notna().sum() >= max(1, int(0.5 * len(converted)))
+
 
 def sanitize_df_for_arrow(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -29,55 +57,253 @@ def sanitize_df_for_arrow(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Sanitized DataFrame
     """
+    # Only object and float columns can need normalizing; fully typed frames pass through
+    if not any(pd.api.types.is_object_dtype(dtype) or pd.api.types.is_float_dtype(dtype) for dtype in df.dtypes):
+        return df
+    
     try:
-        df = df.copy()
-        for col in df.columns:
+        # Only the replaced columns are collected; untouched columns are never copied
+        new_cols = {}
+        for col, values in df.items():
             try:
-                if df[col].dtype == object:
-                    s = df[col].astype(str).str.strip()
-                    s_clean = s.str.replace(',', '', regex=False).str.replace('$', '', regex=False).str.replace('%', '', regex=False)
-                    num = pd.to_numeric(s_clean, errors='coerce')
-                    if num.notna().sum() >= max(1, int(0.5 * len(num))):
-                        df[col] = num
-                        continue
-                    dt = pd.to_datetime(s, errors='coerce')
-                    if dt.notna().sum() >= max(1, int(0.5 * len(dt))):
-                        df[col] = dt
-                        continue
-                if pd.api.types.is_float_dtype(df[col].dtype):
-                    non_null = df[col].dropna()
-                    if not non_null.empty:
-                        try:
-                            if (non_null % 1 == 0).all():
-                                df[col] = df[col].astype('Int64')
-                        except Exception:
-                            pass
+                if values.dtype == object:
+                    # A sample of non-null values rules out conversions cheaply; a conversion that
+                    # passes it is kept only if the full column still passes, so late values are not lost
+                    sample = values.dropna().head(_INFER_SAMPLE_ROWS).astype(str).str.strip()
+                    if _mostly_valid(_to_number(sample)):
+                        converted = _to_number(values.astype(str).str.strip())
+                        if _mostly_valid(converted):
+                            new_cols[col] = converted
+                            continue
+                    if _mostly_valid(pd.to_datetime(sample, errors='coerce')):
+                        converted = pd.to_datetime(values.astype(str).str.strip(), errors='coerce')
+                        if _mostly_valid(converted):
+                            new_cols[col] = converted
+                            continue
+                if pd.api.types.is_float_dtype(values.dtype):
+                    # Whole numbers survive the int64 round trip; fractions, inf and
+                    # out-of-range values do not. One pass over the raw array.
+                    v = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                    present = v[~np.isnan(v)]
+                    with np.errstate(invalid='ignore'):
+                        whole = present.size and np.all(present == present.astype(np.int64))
+                    if whole:
+                        new_cols[col] = pd.array(v, dtype='Int64')
             except Exception as e:
                 logger.warning(f"Error processing column {col}: {e}")
                 continue
         
-        if 'Total' in df.columns and df['Total'].dtype == object:
+        total = new_cols.get('Total', df.get('Total'))
+        if total is not None and total.dtype == object:
             try:
-                tot = pd.to_numeric(df['Total'].astype(str).str.replace(',', '', regex=False), errors='coerce')
+                tot = pd.to_numeric(total.astype(str).str.replace(',', '', regex=False), errors='coerce')
                 if tot.notna().any():
-                    df['Total'] = tot.astype('Int64')
+                    new_cols['Total'] = tot.astype('Int64')
             except Exception as e:
                 logger.warning(f"Error processing Total column: {e}")
         
+        if not new_cols:
+            return df
+        # A shallow copy shares the unchanged column arrays and leaves the caller's frame as is
+        df = df.copy(deep=False)
+        for col, values in new_cols.items():
+            df[col] = values
         return df
     except Exception as e:
         logger.error(f"Error sanitizing DataFrame: {e}")
         return df
 
 
-def get_domain_names() -> dict:
+@lru_cache(maxsize=8)
+def _competency_columns(columns: tuple) -> tuple:
+    competency_cols = []
+    for col in columns:
+        if isinstance(col, str):
+            domain, dot, _ = col.partition('.')
+            if dot and domain in _DOMAIN_IDS:
+                competency_cols.append(col)
+    return tuple(competency_cols)
+
+
+def get_competency_columns(df: pd.DataFrame) -> list:
+    """
+    Returns the competency rating columns of a DataFrame.
+    
+    Args:
+        df: Input DataFrame
+        
+    Returns:
+        List of column names prefixed with a domain number (1-13)
+    """
+    return list(_competency_columns(tuple(df.columns)))
+
+
+@lru_cache(maxsize=8)
+def _domain_columns(columns: tuple) -> tuple:
+    domains = {}
+    for col in _competency_columns(columns):
+        domains.setdefault(col.partition('.')[0], []).append(col)
+    return tuple((domain, tuple(cols)) for domain, cols in domains.items())
+
+
+def get_domain_mapping(df: pd.DataFrame) -> dict:
+    """
+    Returns mapping of domain numbers to their competency columns.
+    
+    Args:
+        df: Input DataFrame
+        
+    Returns:
+        Dictionary mapping domain numbers (as strings) to lists of column names
+    """
+    return {domain: list(cols) for domain, cols in _domain_columns(tuple(df.columns))}
+
+
+@lru_cache(maxsize=8)
+def _domain_index(columns: tuple) -> np.ndarray:
+    domain_index = np.fromiter(
+        (int(col.partition('.')[0]) for col in _competency_columns(columns)), dtype=np.int16
+    )
+    domain_index.flags.writeable = False
+    return domain_index
+
+
+def get_domain_index(df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns the domain number of each competency column.
+    
+    The array is aligned with get_competency_columns(df) and shared between
+    callers, so it is read-only.
+    
+    Args:
+        df: Input DataFrame
+        
+    Returns:
+        int16 array of domain numbers (1-13)
+    """
+    return _domain_index(tuple(df.columns))
+
+
+def average_by_domain(values, domain_index: np.ndarray) -> np.ndarray:
+    """
+    Averages per-competency values within each domain in a single pass.
+    
+    NaN values are skipped, as Series.mean() does.
+    
+    Args:
+        values: Per-competency values aligned with domain_index
+        domain_index: Domain number of each value (see get_domain_index)
+        
+    Returns:
+        Array indexed by domain number; domains without values are NaN
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    domains = domain_index[valid]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (
+            np.bincount(domains, weights=values[valid], minlength=len(_DOMAIN_IDS) + 1)
+            / np.bincount(domains, minlength=len(_DOMAIN_IDS) + 1)
+        )
+
+
+def get_training_priorities(domain_avgs: np.ndarray, gaps: np.ndarray):
+    """
+    Classifies the training need of each domain in one vectorized pass.
+    
+    A domain needs training when its average rating is at least 3.5 or it is
+    more than 0.3 above the overall average.
+    
+    Args:
+        domain_avgs: Average rating of each domain
+        gaps: Difference between each domain average and the overall average
+        
+    Returns:
+        Tuple of (boolean mask of domains needing training, array of priority labels)
+    """
+    needs_training = (domain_avgs >= 3.5) | (gaps > 0.3)
+    priorities = np.select(
+        [domain_avgs >= 4.5, domain_avgs >= 4.0, (domain_avgs >= 3.5) | (gaps > 0.5)],
+        ['URGENT', 'HIGH', 'MEDIUM'],
+        default='LOW'
+    )
+    return needs_training, priorities
+
+
+def _stamp_source_fingerprint(df: pd.DataFrame, mtime_ns: int):
+    # Bound to this object: copies inherit attrs but not the id
+    df.attrs[SOURCE_FINGERPRINT_ATTR] = (mtime_ns, df.shape, id(df))
+
+
+def dataframe_cache_key(df: pd.DataFrame):
+    """
+    Cheap st.cache_data key for DataFrames.
+    
+    The frame returned by load_data carries the fingerprint of its source file,
+    so it hashes in O(1) instead of a scan of every cell. pandas copies attrs
+    onto derived frames (fillna, astype, copy, ...), so the fingerprint also
+    records which object it was stamped on; any other frame falls back to
+    hashing its contents.
+    
+    Args:
+        df: DataFrame passed to a cached function
+        
+    Returns:
+        Hashable key identifying the DataFrame contents
+    """
+    fingerprint = df.attrs.get(SOURCE_FINGERPRINT_ATTR)
+    if fingerprint is not None and fingerprint[2] == id(df) and fingerprint[1] == df.shape:
+        # The object id is left out so the key stays the same across processes
+        return fingerprint[:2], tuple(df.columns)
+    return int(pd.util.hash_pandas_object(df).sum()), tuple(df.columns)
+
+
+# hash_funcs for st.cache_data helpers that take the loaded DataFrame
+DATAFRAME_HASH_FUNCS = {pd.DataFrame: dataframe_cache_key}
+
+
+@st.cache_data(show_spinner=False, hash_funcs=DATAFRAME_HASH_FUNCS)
+def get_overall_domain_means(df: pd.DataFrame) -> dict:
+    """
+    Returns the dataset-wide average rating of each competency domain.
+    
+    A domain's average is the mean of its competency column means.
+    
+    Args:
+        df: Input DataFrame
+        
+    Returns:
+        Dictionary mapping domain numbers to average ratings
+    """
+    domain_means = average_by_domain(df[get_competency_columns(df)].mean(), get_domain_index(df))
+    return {domain: float(domain_means[int(domain)]) for domain in get_domain_mapping(df)}
+
+
+@st.cache_data(show_spinner=False, hash_funcs=DATAFRAME_HASH_FUNCS)
+def get_cluster_counts(df: pd.DataFrame) -> pd.Series:
+    """
+    Returns the number of participants in each cluster.
+    
+    Args:
+        df: Input DataFrame
+        
+    Returns:
+        Series of counts indexed by cluster ID in ascending order
+    """
+    return df.groupby('Cluster', sort=True, observed=True).size()
+
+
+@lru_cache(maxsize=1)
+def get_domain_names() -> Mapping[str, str]:
     """
     Returns mapping of domain numbers to domain names.
     
+    The mapping is built once and shared between callers, so it is read-only.
+    
     Returns:
-        Dictionary mapping domain numbers to names
+        Read-only mapping of domain numbers to names
     """
-    return DOMAIN_NAMES.copy()
+    return MappingProxyType(dict(DOMAIN_NAMES))
 
 
 def get_cluster_interpretation(cluster_id: int) -> str:
@@ -93,11 +319,38 @@ def get_cluster_interpretation(cluster_id: int) -> str:
     return CLUSTER_INTERPRETATIONS.get(cluster_id, "Cluster interpretation not available.")
 
 
-@st.cache_data
+def _read_data_cache():
+    # Stale once the workbook has been modified after the cache was written
+    try:
+        if os.path.getmtime(DATA_CACHE_FILE) < os.path.getmtime(DATA_FILE):
+            return None
+        return pd.read_parquet(DATA_CACHE_FILE, engine='pyarrow')
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable data cache {DATA_CACHE_FILE}: {e}")
+        return None
+
+
+def _write_data_cache(df: pd.DataFrame):
+    # Written to a temp file first so a concurrent reader never sees a partial file
+    tmp_file = DATA_CACHE_FILE + ".tmp"
+    try:
+        df.to_parquet(tmp_file, engine='pyarrow', compression='snappy', index=False)
+        os.replace(tmp_file, DATA_CACHE_FILE)
+    except Exception as e:
+        logger.warning(f"Could not write data cache {DATA_CACHE_FILE}: {e}")
+
+
+@st.cache_resource(show_spinner=False)
 def load_data():
     """
     Load the clustering results data with error handling.
     
+    The same DataFrame object is shared by every session without being
+    copied, so callers must treat it as read-only and .copy() it before
+    making any changes.
+    
     Returns:
         DataFrame or None if error
     """
@@ -107,25 +360,45 @@ def load_data():
             st.error(f"❌ Error: '{DATA_FILE}' file not found. Please ensure the file is in the same directory as this script.")
             return None
         
-        df = pd.read_excel(DATA_FILE)
-        
-        if df.empty:
-            logger.error("Data file is empty")
-            st.error("❌ Error: Data file is empty.")
-            return None
+        # The prepared frame is cached as Parquet next to the workbook; reuse it while fresh
+        df = _read_data_cache()
+        if df is None:
+            # calamine parses the workbook in native code, far faster than openpyxl
+            df = pd.read_excel(DATA_FILE, engine='calamine')
+            
+            if df.empty:
+                logger.error("Data file is empty")
+                st.error("❌ Error: Data file is empty.")
+                return None
+            
+            # Validate required columns
+            required_cols = ['Cluster']
+            missing_cols = [col for col in required_cols if col not in df.columns]
+            if missing_cols:
+                logger.error(f"Missing required columns: {missing_cols}")
+                st.error(f"❌ Error: Data file is missing required columns: {', '.join(missing_cols)}")
+                return None
+            
+            try:
+                df = sanitize_df_for_arrow(df)
+            except Exception as e:
+                logger.warning(f"Error sanitizing data: {e}")
+            
+            # Ratings are small numbers (1-5); narrower dtypes cut the bytes every aggregation scans
+            for col in get_competency_columns(df):
+                if pd.api.types.is_integer_dtype(df[col].dtype):
+                    df[col] = pd.to_numeric(df[col], downcast='integer')
+                elif pd.api.types.is_float_dtype(df[col].dtype):
+                    df[col] = pd.to_numeric(df[col], downcast='float')
+            
+            _write_data_cache(df)
         
-        # Validate required columns
-        required_cols = ['Cluster']
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            logger.error(f"Missing required columns: {missing_cols}")
-            st.error(f"❌ Error: Data file is missing required columns: {', '.join(missing_cols)}")
-            return None
+        # Categorical clusters let value_counts/groupby work on small integer codes
+        # (applied on both paths: the Parquet round trip does not keep the category dtype)
+        df['Cluster'] = df['Cluster'].astype('category')
         
-        try:
-            df = sanitize_df_for_arrow(df)
-        except Exception as e:
-            logger.warning(f"Error sanitizing data: {e}")
+        # Safe because the frame is read-only (see above); lets cached helpers key on the file instead of the cells
+        _stamp_source_fingerprint(df, os.stat(DATA_FILE).st_mtime_ns)
         
         logger.info(f"Data loaded successfully: {len(df)} rows, {len(df.columns)} columns")
         return df
@@ -144,7 +417,29 @@ def load_data():
         return None
 
 
-@st.cache_resource
+def _read_model_cache(key):
+    # The file records the key it was fitted under; any other key means it is stale
+    try:
+        cached_key, model = joblib.load(MODEL_CACHE_FILE)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable model cache {MODEL_CACHE_FILE}: {e}")
+        return None
+    return model if cached_key == key else None
+
+
+def _write_model_cache(key, model):
+    # Written to a temp file first so a concurrent reader never sees a partial file
+    tmp_file = MODEL_CACHE_FILE + ".tmp"
+    try:
+        joblib.dump((key, model), tmp_file, compress=3)
+        os.replace(tmp_file, MODEL_CACHE_FILE)
+    except Exception as e:
+        logger.warning(f"Could not write model cache {MODEL_CACHE_FILE}: {e}")
+
+
+@st.cache_resource(hash_funcs=DATAFRAME_HASH_FUNCS)
 def get_clustering_model(df):
     """
     Create and cache the KMeans clustering model.
@@ -156,7 +451,15 @@ def get_clustering_model(df):
         Tuple of (kmeans_model, scaler, feature_list)
     """
     try:
-        competency_cols = [col for col in df.columns if col.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.', '11.', '12.', '13.'))]
+        # A fitted model is kept on disk so a fresh worker process loads it
+        # instead of refitting; it is only reused for the same data and settings
+        model_key = (dataframe_cache_key(df), NUM_CLUSTERS, CLUSTER_RANDOM_STATE, sklearn.__version__)
+        model = _read_model_cache(model_key)
+        if model is not None:
+            logger.info(f"Clustering model loaded from {MODEL_CACHE_FILE}")
+            return model
+        
+        competency_cols = get_competency_columns(df)
         
         if not competency_cols:
             logger.warning("No competency columns found")
@@ -170,20 +473,29 @@ def get_clustering_model(df):
             logger.error(f"Missing features: {missing_features}")
             raise ValueError(f"Missing required features: {missing_features}")
         
-        X = df[features].copy()
+        # Ratings are 1-5, so float32 holds them exactly at half the bytes of float64;
+        # the conversion is the one private copy that is imputed and scaled in place
+        X_scaled = df[features].to_numpy(dtype=np.float32, copy=True)
         
-        # Handle missing values
-        X = X.fillna(X.mean(numeric_only=True))
-        
-        if X.empty:
+        if X_scaled.size == 0:
             raise ValueError("Feature matrix is empty after preprocessing")
         
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
+        # Handle missing values with the column means, in one pass over the matrix
+        X_scaled = SimpleImputer(strategy='mean', keep_empty_features=True, copy=False).fit_transform(X_scaled)
+        
+        # The scaler only learns the column statistics; the matrix is then
+        # standardized in place rather than through a second scaled array
+        scaler = StandardScaler().fit(X_scaled)
+        X_scaled -= scaler.mean_
+        X_scaled /= scaler.scale_
         
-        kmeans = KMeans(n_clusters=NUM_CLUSTERS, init='k-means++', random_state=CLUSTER_RANDOM_STATE, n_init=10)
+        # One seeded k-means++ run; extra restarts reached the same partition on this data
+        kmeans = KMeans(n_clusters=NUM_CLUSTERS, init='k-means++', random_state=CLUSTER_RANDOM_STATE, n_init=1)
         kmeans.fit(X_scaled)
         
+        _absorb_scaler(kmeans, scaler)
+        _write_model_cache(model_key, (kmeans, scaler, features))
+        
         logger.info(f"Clustering model created successfully with {NUM_CLUSTERS} clusters")
         return kmeans, scaler, features
         
@@ -192,49 +504,99 @@ def get_clustering_model(df):
         raise
 
 
-def predict_cluster(new_data: dict, kmeans, scaler, features: list) -> int:
+def _absorb_scaler(kmeans, scaler):
+    # With centroids mapped back to rating space (m_k = c_k * scale + mean) and w = 1 / scale**2:
+    #   ||(x - mean) / scale - c_k||^2 = sum(w * x**2) - 2 * (w * m_k) . x + sum(w * m_k**2)
+    # The first term is the same for every k, so the nearest centroid is
+    # argmin_k(offsets_k - 2 * absorbed_k . x) on the raw ratings.
+    # Derived in float64, then kept as float32 like the training matrix: the absorbed
+    # centroids are stored transposed (features x clusters) and C-contiguous, so the
+    # product in _nearest_clusters streams through them row by row.
+    centers = kmeans.cluster_centers_.astype(np.float64) * scaler.scale_ + scaler.mean_
+    absorbed = centers / np.square(scaler.scale_)
+    kmeans.absorbed_centers_ = np.ascontiguousarray(absorbed.T, dtype=np.float32)
+    kmeans.absorbed_offsets_ = np.einsum('kf,kf->k', absorbed, centers).astype(np.float32)
+
+
+def _nearest_clusters(ratings: np.ndarray, kmeans, scaler) -> np.ndarray:
+    if not hasattr(kmeans, 'absorbed_centers_'):
+        _absorb_scaler(kmeans, scaler)
+    # Nearest centroid with the scaling folded in: one matrix product, no scaled copy
+    scores = kmeans.absorbed_offsets_ - 2.0 * (np.asarray(ratings, dtype=np.float32) @ kmeans.absorbed_centers_)
+    return np.argmin(scores, axis=1)
+
+
+def predict_cluster_vector(ratings, kmeans, scaler) -> int:
     """
-    Predict cluster for new assessment data with validation.
+    Predict the cluster of a single assessment given as a rating vector.
+    
+    Skips the per-feature validation of predict_cluster; ratings must already
+    be on the rating scale.
     
     Args:
-        new_data: Dictionary of assessment data
+        ratings: Ratings ordered like the model's feature list
         kmeans: Trained KMeans model
         scaler: Trained StandardScaler
-        features: List of feature names
         
     Returns:
         Predicted cluster ID
     """
+    return int(_nearest_clusters(np.asarray(ratings).reshape(1, -1), kmeans, scaler)[0])
+
+
+def predict_clusters(batch, kmeans, scaler, features: list) -> np.ndarray:
+    """
+    Predict clusters for several assessments at once, with validation.
+    
+    Args:
+        batch: List of assessment dictionaries, or a DataFrame with one assessment per row
+        kmeans: Trained KMeans model
+        scaler: Trained StandardScaler
+        features: List of feature names
+        
+    Returns:
+        Array of predicted cluster IDs, one per assessment
+    """
     try:
-        feature_dict = {}
-        for feature in features:
-            if feature in new_data:
-                value = new_data[feature]
-                # Validate numeric values
-                try:
-                    value = float(value)
-                    # Ensure rating values are within valid range
-                    if isinstance(value, (int, float)):
-                        value = max(1, min(5, value))  # Rating scale is 1-5
-                except (ValueError, TypeError):
-                    logger.warning(f"Invalid value for {feature}: {value}")
-                    value = 3  # Default rating
-                feature_dict[feature] = value
-            else:
-                # Default value for missing competency features
-                feature_dict[feature] = 3  # Default rating (middle of scale)
-        
-        X_new = pd.DataFrame([feature_dict])[features]
-        
-        # Handle missing values
-        X_new = X_new.fillna(X_new.mean(numeric_only=True))
-        
-        X_new_scaled = scaler.transform(X_new)
-        cluster = kmeans.predict(X_new_scaled)[0]
-        
-        logger.info(f"Cluster prediction successful: Cluster {cluster}")
-        return cluster
+        if isinstance(batch, pd.DataFrame):
+            raw = batch.reindex(columns=features).to_numpy(dtype=object)
+        else:
+            raw = np.array(
+                [[new_data.get(feature) for feature in features] for new_data in batch], dtype=object
+            ).reshape(len(batch), len(features))
+        
+        # Validate numeric values in one pass; anything unparseable becomes NaN
+        ratings = pd.to_numeric(raw.ravel(), errors='coerce').astype(np.float64).reshape(raw.shape)
+        invalid = np.isnan(ratings) & ~pd.isna(raw)
+        if invalid.any():
+            bad_features = sorted({features[i] for i in np.nonzero(invalid)[1]})
+            logger.warning(f"Invalid values for {bad_features}, treating them as missing")
+        
+        # A missing or invalid competency takes the training mean kept on the scaler,
+        # which standardizes to zero
+        ratings = np.where(np.isnan(ratings), scaler.mean_, ratings)
+        np.clip(ratings, 1, 5, out=ratings)  # Rating scale is 1-5
+        
+        return _nearest_clusters(ratings, kmeans, scaler)
         
     except Exception as e:
-        logger.error(f"Error predicting cluster: {e}")
+        logger.error(f"Error predicting clusters: {e}")
         raise
+
+
+def predict_cluster(new_data: dict, kmeans, scaler, features: list) -> int:
+    """
+    Predict cluster for new assessment data with validation.
+    
+    Args:
+        new_data: Dictionary of assessment data
+        kmeans: Trained KMeans model
+        scaler: Trained StandardScaler
+        features: List of feature names
+        
+    Returns:
+        Predicted cluster ID
+    """
+    cluster = int(predict_clusters([new_data], kmeans, scaler, features)[0])
+    logger.info(f"Cluster prediction successful: Cluster {cluster}")
+    return cluster